@@ -10,6 +10,7 @@ import os
 import sys
 import locale
 import codecs
+import unicodedata
 
 # Set up locale for proper handling of non-ASCII characters
 try:
@@ -17,34 +18,51 @@ try:
 except:
     pass  # Fail silently if locale setting fails
 
+# UTF-8 encoded Latin-1 characters that were decoded as Latin-1, e.g. 'Ã©'
+# for 'é'. A bare 'Ã' is what is left of 'í' once Windows drops the soft
+# hyphen that follows it.
+_MOJIBAKE_RE = re.compile('[\xc2\xc3][\x80-\xbf]|\xc3')
+
+def _undo_mojibake(match):
+    """Decode a single mojibake sequence back into the intended character."""
+    sequence = match.group(0)
+    if len(sequence) == 1:
+        return 'í'
+    return sequence.encode('latin-1').decode('utf-8')
+
+# fix_encoding is applied once, where text enters the program (the end of
+# ScrollableTextbox.edit). Everything downstream assumes NFC text with no mojibake.
 def fix_encoding(text):
     """
     Fix common encoding issues when pasting text in Windows.
-    Converts incorrectly encoded characters back to their proper form.
+    Converts incorrectly encoded characters back to their proper form and
+    normalizes the result to NFC so composed and decomposed accents compare equal.
     """
-    encoding_fixes = {
-        'Ã¡': 'á',
-        'Ã©': 'é',
-        'Ã­': 'í',
-        'Ã³': 'ó',
-        'Ãº': 'ú',
-        'Ã±': 'ñ',
-        'Ã': 'í',  # Sometimes just the first part appears
-        'Â¡': '¡',
-        'Â¿': '¿',
-        'Ã\x81': 'Á',
-        'Ã\x89': 'É',
-        'Ã\x8d': 'Í',
-        'Ã\x93': 'Ó',
-        'Ã\x9a': 'Ú',
-        'Ã\x91': 'Ñ',
-    }
-    
-    for wrong, correct in encoding_fixes.items():
-        text = text.replace(wrong, correct)
+    # Plain ASCII can neither contain mojibake nor need normalizing
+    if text.isascii():
+        return text
+    
+    if 'Ã' in text or 'Â' in text:
+        text = _MOJIBAKE_RE.sub(_undo_mojibake, text)
+    
+    if not unicodedata.is_normalized('NFC', text):
+        text = unicodedata.normalize('NFC', text)
     
     return text
 
+def set_cursor_visibility(visibility):
+    """Set the cursor visibility, ignoring terminals that don't support it."""
+    try:
+        curses.curs_set(visibility)
+    except curses.error:
+        pass
+
+INSTRUCTIONS = "Ctrl+G to save | Arrow keys to navigate | Ctrl+V to paste"
+
+# Keys that follow ESC at the start and end of a bracketed paste
+PASTE_START = list("[200~")
+PASTE_END = list("[201~")
+
 class ScrollableTextbox:
     """A scrollable text editor using curses with support for special characters."""
     
@@ -62,27 +80,72 @@ class ScrollableTextbox:
         self.current_col = 0
         self.scroll_pos = 0
         
+        # The line under the cursor is edited in a gap buffer: characters before
+        # the cursor in _left, characters after it in _right (reversed), so typing
+        # and deleting only push/pop at the ends. Its entry in self.lines is stale
+        # until _store_line writes it back. _line_cache holds its joined text
+        # until the next edit, so redraws and cursor moves don't rebuild it.
+        self._left = []
+        self._right = []
+        self._line_cache = ""
+        
+        # Display state: indices of lines that need redrawing, whether the border
+        # needs redrawing, and the scroll position and indicators last drawn
+        self._dirty = set()
+        self._border_dirty = True
+        self._drawn_scroll = None
+        self._drawn_indicators = None
+        
+        # The horizontal edges of the border only depend on the width
+        self._top_border = "┌" + "─" * self.width + "┐"
+        self._bottom_border = "└" + "─" * self.width + "┘"
+        
+        # Handlers for special keys and control characters
+        self._key_handlers = {
+            curses.KEY_UP: self._move_up,
+            curses.KEY_DOWN: self._move_down,
+            curses.KEY_LEFT: self._move_left,
+            curses.KEY_RIGHT: self._move_right,
+            curses.KEY_HOME: self._home,
+            curses.KEY_END: self._end,
+            curses.KEY_PPAGE: self._page_up,
+            curses.KEY_NPAGE: self._page_down,
+            10: self._insert_newline,  # Enter
+            127: self._backspace,  # Backspace
+            curses.KEY_BACKSPACE: self._backspace,
+            curses.KEY_DC: self._delete,  # Delete
+            curses.KEY_RESIZE: self._handle_resize,  # Terminal resize
+            22: self._handle_paste,  # Ctrl+V (paste)
+            27: self._handle_escape,  # Escape, possibly starting a bracketed paste
+        }
+        
         # Create a window for the editor
         self.win = curses.newwin(height, width, y, x)
         self.win.keypad(True)
         
-        # Create instructions window
-        self.instructions_win = curses.newwin(1, width, y + height, x)
-        self.instructions_win.addstr(0, 0, "Ctrl+G to save | Arrow keys to navigate | Ctrl+V to paste")
-        self.instructions_win.refresh()
+        # _update_display already rewrites exactly the lines that changed, so
+        # don't let curses try insert/delete line or character tricks (or
+        # scroll regions) on top of that. The cursor must stay where it's put.
+        self.win.idlok(False)
+        self.win.idcok(False)
+        self.win.scrollok(False)
+        self.win.leaveok(False)
         
-        # Draw a rectangle around the editor
-        self._draw_border()
-        self.stdscr.refresh()
+        # Create instructions window; its cursor position never matters, so
+        # refreshing it shouldn't pull the cursor out of the editor
+        self.instructions_win = curses.newwin(1, width, y + height, x)
+        self.instructions_win.leaveok(True)
+        self._show_instructions(INSTRUCTIONS)
+        self._paste_prompt_shown = False
         
-        # Initialize cursor
+        # Draw a rectangle around the editor and initialize cursor
         self._update_display()
     
     def _draw_border(self):
         """Draw a border around the editor with the prompt."""
         self.stdscr.attron(curses.A_BOLD)
         # Draw top border with title
-        self.stdscr.addstr(self.y-1, self.x-1, "┌" + "─" * (self.width) + "┐")
+        self.stdscr.addstr(self.y-1, self.x-1, self._top_border)
         self.stdscr.addstr(self.y-1, self.x+2, f" {self.prompt} ")
         
         # Draw side borders
@@ -91,48 +154,101 @@ class ScrollableTextbox:
             self.stdscr.addstr(self.y+i, self.x+self.width, "│")
         
         # Draw bottom border
-        self.stdscr.addstr(self.y+self.height, self.x-1, "└" + "─" * (self.width) + "┘")
+        self.stdscr.addstr(self.y+self.height, self.x-1, self._bottom_border)
         self.stdscr.attroff(curses.A_BOLD)
         
-        # Add scrollbar indicators if needed
-        if len(self.lines) > self.height:
-            # Show up arrow if scrolled down
-            if self.scroll_pos > 0:
-                self.stdscr.addstr(self.y, self.x+self.width, "↑")
-            
-            # Show down arrow if can scroll down more
-            if self.scroll_pos + self.height < len(self.lines):
-                self.stdscr.addstr(self.y+self.height-1, self.x+self.width, "↓")
+        # The side borders just overwrote any scroll indicators
+        self._drawn_indicators = None
+        self._draw_scroll_indicators()
+    
+    def _draw_scroll_indicators(self):
+        """
+        Show arrows on the right border when there is more text above or below.
+        Returns True if the indicators changed and were redrawn.
+        """
+        overflow = len(self.lines) > self.height
+        indicators = (
+            overflow and self.scroll_pos > 0,
+            overflow and self.scroll_pos + self.height < len(self.lines),
+        )
+        if indicators == self._drawn_indicators:
+            return False
+        self._drawn_indicators = indicators
+        
+        # Draw the arrow, or put back the bold side border when there is none
+        show_up, show_down = indicators
+        for row, show, arrow in ((self.y, show_up, "↑"), (self.y+self.height-1, show_down, "↓")):
+            if show:
+                self.stdscr.addstr(row, self.x+self.width, arrow)
+            else:
+                self.stdscr.addstr(row, self.x+self.width, "│", curses.A_BOLD)
+        return True
     
     def _update_display(self):
-        """Update the display with current content and cursor position."""
-        self.win.clear()
-        
+        """Redraw the lines that changed and update the cursor position."""
         # Make sure scroll position is valid
         self._adjust_scroll()
         
-        # Display visible lines
-        display_lines = self.lines[self.scroll_pos:self.scroll_pos+self.height]
-        for i, line in enumerate(display_lines):
-            if i < self.height:
-                try:
-                    self.win.addstr(i, 0, line[:self.width-1])
-                except curses.error:
-                    # Handle potential curses errors when displaying special characters
-                    # Just display what we can and continue
-                    pass
+        # Scrolling moves every visible line
+        if self.scroll_pos != self._drawn_scroll:
+            self._mark_dirty(self.scroll_pos)
+            self._drawn_scroll = self.scroll_pos
+        
+        # Hide the cursor while a larger redraw is written so it doesn't
+        # visibly jump around the screen
+        bulk = len(self._dirty) > 1 or self._border_dirty
+        if bulk:
+            set_cursor_visibility(0)
+        
+        # Redraw visible lines that changed, blanking rows past the end of the text
+        for index in self._dirty:
+            row = index - self.scroll_pos
+            if not 0 <= row < self.height:
+                continue
+            if index == self.current_line:
+                line = self._line_text()
+            elif index < len(self.lines):
+                line = self.lines[index]
+            else:
+                line = ""
+            self.win.move(row, 0)
+            self.win.clrtoeol()
+            try:
+                self.win.addstr(row, 0, line[:self.width-1])
+            except curses.error:
+                # Handle potential curses errors when displaying special characters
+                # Just display what we can and continue
+                pass
+        self._dirty.clear()
         
         # Position cursor
         cursor_y = self.current_line - self.scroll_pos
-        cursor_x = min(self.current_col, len(self.lines[self.current_line]))
+        cursor_x = self.current_col
         try:
             self.win.move(cursor_y, cursor_x)
         except curses.error:
             # Fallback to a safe position if there's an error
             self.win.move(0, 0)
         
-        self._draw_border()
-        self.win.refresh()
+        if self._border_dirty:
+            self._draw_border()
+            self._border_dirty = False
+            self.stdscr.noutrefresh()
+            # stdscr is blank behind the editor, so copy the whole window over it
+            self.win.touchwin()
+        elif self._draw_scroll_indicators():
+            self.stdscr.noutrefresh()
+        
+        # Send all changes to the terminal at once
+        self.win.noutrefresh()
+        curses.doupdate()
+        
+        if bulk:
+            set_cursor_visibility(1)
+    
+    def _mark_dirty(self, start):
+        """Mark lines from start to the bottom of the viewport for redrawing."""
+        self._dirty.update(range(start, self.scroll_pos + self.height))
     
     def _adjust_scroll(self):
         """Adjust scroll position based on cursor."""
@@ -146,138 +262,291 @@ class ScrollableTextbox:
     
     def edit(self):
         """Start the editor and return the entered text."""
-        self.win.clear()
-        self.win.refresh()
-        
-        # Main editing loop
-        while True:
-            self._update_display()
-            
-            try:
-                ch = self.win.getch()
+        # Have the terminal mark where pasted text starts and ends
+        self._set_bracketed_paste(True)
+        try:
+            # Main editing loop
+            while True:
+                self._update_display()
                 
-                # Save and exit with Ctrl+G
-                if ch == 7:  # Ctrl+G
-                    break
+                try:
+                    ch = self._get_key()
+                    
+                    # Any input after Ctrl+V ends the paste prompt
+                    if self._paste_prompt_shown:
+                        self._show_instructions(INSTRUCTIONS)
+                        self._paste_prompt_shown = False
+                    
+                    # Handle this key and anything already queued behind it (e.g. the
+                    # rest of a paste) before redrawing
+                    if self._handle_key(ch) or self._drain_input():
+                        break
                 
-                # Handle special keys
-                elif ch == curses.KEY_UP:
-                    self._move_up()
-                elif ch == curses.KEY_DOWN:
-                    self._move_down()
-                elif ch == curses.KEY_LEFT:
-                    self._move_left()
-                elif ch == curses.KEY_RIGHT:
-                    self._move_right()
-                elif ch == curses.KEY_HOME:
-                    self.current_col = 0
-                elif ch == curses.KEY_END:
-                    self.current_col = len(self.lines[self.current_line])
-                elif ch == curses.KEY_PPAGE:  # Page Up
-                    self._page_up()
-                elif ch == curses.KEY_NPAGE:  # Page Down
-                    self._page_down()
-                elif ch == 10:  # Enter
-                    self._insert_newline()
-                elif ch == 127 or ch == curses.KEY_BACKSPACE:  # Backspace
-                    self._backspace()
-                elif ch == curses.KEY_DC:  # Delete
-                    self._delete()
-                elif ch == curses.KEY_RESIZE:  # Terminal resize
-                    self._handle_resize()
-                elif ch == 22:  # Ctrl+V (paste)
-                    self._handle_paste()
-                # Handle regular printable characters and extended characters
-                elif 32 <= ch <= 126 or ch > 127:  # ASCII printable and Unicode characters
-                    # Convert character code to actual character
-                    char = chr(ch)
-                    self._insert_char(char)
-            
-            except KeyboardInterrupt:
-                return ""
+                except KeyboardInterrupt:
+                    return ""
+        finally:
+            self._set_bracketed_paste(False)
         
         # Return the complete text with encoding fixes
+        self._store_line()
         result = '\n'.join(self.lines)
         return fix_encoding(result)
     
+    def _set_bracketed_paste(self, enabled):
+        """Turn the terminal's bracketed paste mode on or off."""
+        # Terminals without bracketed paste ignore these sequences
+        sys.stdout.write("\x1b[?2004h" if enabled else "\x1b[?2004l")
+        sys.stdout.flush()
+    
+    def _get_key(self, wait=True):
+        """
+        Read the next key: a str for characters or an int for special keys.
+        Returns None if wait is False and no input is waiting.
+        """
+        if wait:
+            return self.win.get_wch()
+        self.win.nodelay(True)
+        try:
+            return self.win.get_wch()
+        except curses.error:
+            return None
+        finally:
+            self.win.nodelay(False)
+    
+    def _drain_input(self):
+        """
+        Handle keys that are already waiting without redrawing in between.
+        Returns True if one of them was Ctrl+G.
+        """
+        ch = self._get_key(wait=False)
+        while ch is not None:
+            if self._handle_key(ch):
+                return True
+            ch = self._get_key(wait=False)
+        return False
+    
+    def _read_escape(self):
+        """
+        Read the keys queued after an ESC, stopping as soon as they can no
+        longer be a bracketed paste marker.
+        """
+        keys = []
+        while len(keys) < len(PASTE_START):
+            ch = self._get_key(wait=False)
+            if ch is None:
+                break
+            keys.append(ch)
+            if keys != PASTE_START[:len(keys)] and keys != PASTE_END[:len(keys)]:
+                break
+        return keys
+    
+    def _read_paste(self):
+        """Insert bracketed paste text up to the end marker without redrawing."""
+        text = []
+        while True:
+            ch = self._get_key()
+            if ch == '\x1b':  # Escape
+                keys = self._read_escape()
+                if keys == PASTE_END:
+                    break
+            else:
+                keys = [ch]
+            
+            # Pasted text is inserted literally, so control keys such as
+            # Ctrl+G don't act on the editor
+            for key in keys:
+                if key == '\n':
+                    self._insert_text(text)
+                    text = []
+                    self._insert_newline()
+                elif isinstance(key, str) and key.isprintable():
+                    text.append(key)
+        
+        self._insert_text(text)
+    
+    def _insert_typed(self, char):
+        """
+        Insert a typed character along with any printable characters already
+        queued behind it, such as the rest of a paste sent as keystrokes.
+        """
+        chars = [char]
+        ch = self._get_key(wait=False)
+        while isinstance(ch, str) and ch.isprintable():
+            chars.append(ch)
+            ch = self._get_key(wait=False)
+        self._insert_text(chars)
+        
+        # Leave the key that ended the run for the main loop
+        if ch is not None:
+            self._unget_key(ch)
+    
+    def _unget_key(self, ch):
+        """Push a key back so the next read returns it."""
+        if isinstance(ch, int):
+            curses.ungetch(ch)
+        else:
+            curses.unget_wch(ch)
+    
+    def _handle_key(self, ch):
+        """Handle a single key press. Returns True on Ctrl+G (save and exit)."""
+        # Characters arrive as str: insert printable ones, and handle control
+        # characters by their code alongside the special keys
+        if isinstance(ch, str):
+            if ch.isprintable():
+                self._insert_typed(ch)
+                return False
+            ch = ord(ch)
+        
+        # Save and exit with Ctrl+G
+        if ch == 7:  # Ctrl+G
+            return True
+        
+        # Handle special keys
+        handler = self._key_handlers.get(ch)
+        if handler is not None:
+            handler()
+        return False
+    
+    def _handle_escape(self):
+        """Handle ESC, which may start a bracketed paste."""
+        keys = self._read_escape()
+        if keys == PASTE_START:
+            self._read_paste()
+            return
+        
+        # Not a paste marker, so push the following keys back for the main
+        # loop; handling them here would let a printable one drain the rest
+        # of the queue ahead of them. Pushed keys are read last in, first out.
+        for key in reversed(keys):
+            self._unget_key(key)
+    
+    def _line_text(self):
+        """Return the text of the line under the cursor."""
+        if self._line_cache is None:
+            self._line_cache = ''.join(self._left) + ''.join(reversed(self._right))
+        return self._line_cache
+    
+    def _load_line(self):
+        """Split the line under the cursor into the gap buffer."""
+        line = self.lines[self.current_line]
+        self._left = list(line[:self.current_col])
+        self._right = list(reversed(line[self.current_col:]))
+        self._line_cache = line
+    
+    def _line_edited(self):
+        """Invalidate the cached text of the line under the cursor."""
+        self._line_cache = None
+    
+    def _store_line(self):
+        """Write the gap buffer back into self.lines."""
+        self.lines[self.current_line] = self._line_text()
+    
+    def _goto(self, line, col):
+        """Move the cursor to another line, clamping col to its length."""
+        self._store_line()
+        self.current_line = line
+        self.current_col = min(col, len(self.lines[line]))
+        self._load_line()
+    
+    def _move(self, delta):
+        """Move cursor down by delta lines (up if negative), stopping at either end."""
+        line = max(0, min(len(self.lines) - 1, self.current_line + delta))
+        if line != self.current_line:
+            self._goto(line, self.current_col)
+    
     def _move_up(self):
         """Move cursor up."""
-        if self.current_line > 0:
-            self.current_line -= 1
-            self.current_col = min(self.current_col, len(self.lines[self.current_line]))
+        self._move(-1)
     
     def _move_down(self):
         """Move cursor down."""
-        if self.current_line < len(self.lines) - 1:
-            self.current_line += 1
-            self.current_col = min(self.current_col, len(self.lines[self.current_line]))
+        self._move(1)
     
     def _move_left(self):
         """Move cursor left."""
-        if self.current_col > 0:
+        if self._left:
+            self._right.append(self._left.pop())
             self.current_col -= 1
         elif self.current_line > 0:
             # Move to end of previous line
-            self.current_line -= 1
-            self.current_col = len(self.lines[self.current_line])
+            self._goto(self.current_line - 1, len(self.lines[self.current_line - 1]))
     
     def _move_right(self):
         """Move cursor right."""
-        if self.current_col < len(self.lines[self.current_line]):
+        if self._right:
+            self._left.append(self._right.pop())
             self.current_col += 1
         elif self.current_line < len(self.lines) - 1:
             # Move to beginning of next line
-            self.current_line += 1
-            self.current_col = 0
+            self._goto(self.current_line + 1, 0)
+    
+    def _home(self):
+        """Move cursor to the start of the line."""
+        self._right.extend(reversed(self._left))
+        self._left.clear()
+        self.current_col = 0
+    
+    def _end(self):
+        """Move cursor to the end of the line."""
+        self._left.extend(reversed(self._right))
+        self._right.clear()
+        self.current_col = len(self._left)
     
     def _page_up(self):
         """Move cursor up by a page."""
-        self.current_line = max(0, self.current_line - self.height)
         self.scroll_pos = max(0, self.scroll_pos - self.height)
-        self.current_col = min(self.current_col, len(self.lines[self.current_line]))
+        self._move(-self.height)
     
     def _page_down(self):
         """Move cursor down by a page."""
-        self.current_line = min(len(self.lines) - 1, self.current_line + self.height)
         self.scroll_pos = min(len(self.lines) - 1, self.scroll_pos + self.height)
-        self.current_col = min(self.current_col, len(self.lines[self.current_line]))
+        self._move(self.height)
     
-    def _insert_char(self, char):
-        """Insert a character at the current position."""
-        current = self.lines[self.current_line]
-        self.lines[self.current_line] = current[:self.current_col] + char + current[self.current_col:]
-        self.current_col += 1
+    def _insert_text(self, chars):
+        """Insert a run of characters at the current position."""
+        self._left.extend(chars)
+        self.current_col += len(chars)
+        self._line_edited()
+        self._dirty.add(self.current_line)
     
     def _insert_newline(self):
         """Insert a new line at the current position."""
-        current = self.lines[self.current_line]
-        self.lines[self.current_line] = current[:self.current_col]
-        self.lines.insert(self.current_line + 1, current[self.current_col:])
+        # Text after the cursor moves down with it and stays in _right
+        self._mark_dirty(self.current_line)
+        self.lines[self.current_line] = ''.join(self._left)
+        self.lines.insert(self.current_line + 1, "")
+        self._left = []
         self.current_line += 1
         self.current_col = 0
+        self._line_edited()
     
     def _backspace(self):
         """Delete the character before the cursor."""
-        if self.current_col > 0:
-            current = self.lines[self.current_line]
-            self.lines[self.current_line] = current[:self.current_col-1] + current[self.current_col:]
+        if self._left:
+            self._left.pop()
             self.current_col -= 1
+            self._line_edited()
+            self._dirty.add(self.current_line)
         elif self.current_line > 0:
             # Join with previous line
-            self.current_col = len(self.lines[self.current_line - 1])
-            self.lines[self.current_line - 1] += self.lines[self.current_line]
             self.lines.pop(self.current_line)
             self.current_line -= 1
+            self._left = list(self.lines[self.current_line])
+            self.current_col = len(self._left)
+            self._line_edited()
+            self._mark_dirty(self.current_line)
     
     def _delete(self):
         """Delete the character at the cursor."""
-        current = self.lines[self.current_line]
-        if self.current_col < len(current):
-            self.lines[self.current_line] = current[:self.current_col] + current[self.current_col+1:]
+        if self._right:
+            self._right.pop()
+            self._line_edited()
+            self._dirty.add(self.current_line)
         elif self.current_line < len(self.lines) - 1:
             # Join with next line
-            self.lines[self.current_line] += self.lines[self.current_line + 1]
-            self.lines.pop(self.current_line + 1)
+            self._right = list(reversed(self.lines.pop(self.current_line + 1)))
+            self._line_edited()
+            self._mark_dirty(self.current_line)
     
     def _handle_paste(self):
         """Handle pasting text from clipboard."""
@@ -287,17 +556,17 @@ class ScrollableTextbox:
         # which sends characters as if they were typed
         
         # Show a message to instruct the user
-        self.instructions_win.clear()
-        self.instructions_win.addstr(0, 0, "Paste your text now... Press Enter when done")
-        self.instructions_win.refresh()
+        self._show_instructions("Paste your text now...")
         
         # Let the terminal handle the paste operation
-        # The characters will be processed one by one as they're typed
-        
-        # After a short delay, restore the normal instructions
-        curses.napms(3000)  # 3 second delay
+        # The characters arrive as if typed and are handled in one batch by
+        # edit(), which also restores the normal instructions
+        self._paste_prompt_shown = True
+    
+    def _show_instructions(self, text):
+        """Replace the text shown below the editor."""
         self.instructions_win.clear()
-        self.instructions_win.addstr(0, 0, "Ctrl+G to save | Arrow keys to navigate | Ctrl+V to paste")
+        self.instructions_win.addstr(0, 0, text)
         self.instructions_win.refresh()
     
     def _handle_resize(self):
@@ -308,9 +577,9 @@ class ScrollableTextbox:
         self.win.resize(min(self.height, height-self.y-1), min(self.width, width-self.x-1))
         self.instructions_win.resize(1, min(self.width, width-self.x-1))
         self.instructions_win.mvwin(min(self.y+self.height, height-1), self.x)
-        self.instructions_win.clear()
-        self.instructions_win.addstr(0, 0, "Ctrl+G to save | Arrow keys to navigate | Ctrl+V to paste")
-        self.instructions_win.refresh()
+        self._mark_dirty(self.scroll_pos)
+        self._border_dirty = True
+        self._show_instructions(INSTRUCTIONS)
     
     def set_text(self, text):
         """Set the editor content from a string."""
@@ -320,8 +589,13 @@ class ScrollableTextbox:
         self.current_line = 0
         self.current_col = 0
         self.scroll_pos = 0
+        self._load_line()
+        self._mark_dirty(self.scroll_pos)
         self._update_display()
 
+# Matches [Name] including names with spaces like [Angel Dust]
+_CHARACTER_SPLIT_RE = re.compile(r'(\[[^\]]+\])')
+
 def parse_character_dialogue(text):
     """
     Parse text that contains character names in square brackets followed by dialogue.
@@ -331,76 +605,56 @@ def parse_character_dialogue(text):
     if not text.strip():
         return []
     
-    # First, fix any encoding issues
-    text = fix_encoding(text)
-    
-    # Use regex to find character names in square brackets
-    # This pattern will match [Name] including names with spaces like [Angel Dust]
-    pattern = r'(\[[^\]]+\])'
-    parts = re.split(pattern, text)
-    
-    # Remove any empty strings at the beginning
-    if parts and not parts[0].strip():
-        parts.pop(0)
-    
-    result = []
-    current_character = None
-    current_dialogue = ""
-    
-    for part in parts:
-        if re.match(r'\[.+\]', part):  # This is a character name
-            # If we already have a character and dialogue, save it
-            if current_character is not None:
-                result.append((current_character, current_dialogue.strip()))
-            
-            # Start a new character's dialogue
-            current_character = part
-            current_dialogue = ""
-        else:
-            # Add to the current dialogue
-            current_dialogue += part
+    # Without any brackets there can be no character names
+    if '[' not in text:
+        return []
     
-    # Add the last character's dialogue if it exists
-    if current_character is not None:
-        result.append((current_character, current_dialogue.strip()))
+    # Split on character names in square brackets. The capturing group keeps
+    # the names, so parts alternate text, [Name], text, [Name], ...
+    parts = _CHARACTER_SPLIT_RE.split(text)
     
-    return result
+    # Each name is followed by exactly one text chunk holding its dialogue;
+    # any text before the first name is dropped
+    return [
+        (character, dialogue.strip())
+        for character, dialogue in zip(parts[1::2], parts[2::2])
+    ]
+
+# LaTeX special characters and their escaped versions
+_LATEX_ESCAPES = str.maketrans({
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '^': r'\textasciicircum{}',
+    '\\': r'\textbackslash{}',
+    '<': r'\textless{}',
+    '>': r'\textgreater{}'
+})
 
 def escape_latex_special_chars(text):
     """
     Escape special LaTeX characters to ensure proper rendering.
     """
-    # Define LaTeX special characters and their escaped versions
-    latex_special_chars = {
-        '&': r'\&',
-        '%': r'\%',
-        '$': r'\$',
-        '#': r'\#',
-        '_': r'\_',
-        '{': r'\{',
-        '}': r'\}',
-        '~': r'\textasciitilde{}',
-        '^': r'\textasciicircum{}',
-        '\\': r'\textbackslash{}',
-        '<': r'\textless{}',
-        '>': r'\textgreater{}'
-    }
-    
-    # Replace special characters with their escaped versions
-    for char, replacement in latex_special_chars.items():
-        text = text.replace(char, replacement)
-    
-    return text
+    # Replace every special character in a single pass
+    return text.translate(_LATEX_ESCAPES)
 
 def generate_latex(title, author, left_dialogues, right_dialogues):
-    """Generate LaTeX document with parallel translation supporting special characters."""
+    """
+    Generate LaTeX document with parallel translation supporting special characters.
+    Yields the document in chunks so it can be written out as it is produced.
+    """
     
     # Escape special LaTeX characters in title and author
     title = escape_latex_special_chars(title)
     author = escape_latex_special_chars(author)
     
     # Preamble with enhanced language support
-    latex = r"""\documentclass[12pt,a4paper]{article}
+    yield r"""\documentclass[12pt,a4paper]{article}
 \usepackage[margin=1in]{geometry}
 \usepackage{parallel}
 \usepackage{fontspec}
@@ -448,49 +702,38 @@ def generate_latex(title, author, left_dialogues, right_dialogues):
     # Ensure we process only the min number of dialogues available in both
     num_dialogues = min(len(left_dialogues), len(right_dialogues))
     
+    # Speakers recur throughout a dialogue, so format each name only once
+    char_names = {}
+    for char, _ in left_dialogues[:num_dialogues] + right_dialogues[:num_dialogues]:
+        if char not in char_names:
+            # Remove brackets for display and escape special characters
+            char_names[char] = escape_latex_special_chars(char.strip('[]'))
+    
     for i in range(num_dialogues):
         left_char, left_text = left_dialogues[i]
         right_char, right_text = right_dialogues[i]
         
-        # Format character names (remove brackets) for display
-        left_char_formatted = left_char.strip('[]')
-        right_char_formatted = right_char.strip('[]')
+        left_char_formatted = char_names[left_char]
+        right_char_formatted = char_names[right_char]
         
-        # Fix any encoding issues
-        left_char_formatted = fix_encoding(left_char_formatted)
-        right_char_formatted = fix_encoding(right_char_formatted)
-        left_text = fix_encoding(left_text)
-        right_text = fix_encoding(right_text)
-        
-        # Escape special characters in all text
-        left_char_formatted = escape_latex_special_chars(left_char_formatted)
-        right_char_formatted = escape_latex_special_chars(right_char_formatted)
-        left_text = escape_latex_special_chars(left_text)
-        right_text = escape_latex_special_chars(right_text)
+        # Escape special characters in the dialogue text and keep its line breaks
+        left_text = escape_latex_special_chars(left_text).replace("\n", r"\\" + "\n")
+        right_text = escape_latex_special_chars(right_text).replace("\n", r"\\" + "\n")
         
         # Add this dialogue pair
-        latex += r"\ParallelLText{%" + "\n"
-        latex += r"\charname{" + left_char_formatted + r"}" + "\n"
-        latex += left_text.replace("\n", r"\\" + "\n") + "\n"
-        latex += "}\n"
-        
-        latex += r"\ParallelRText{%" + "\n"
-        latex += r"\charname{" + right_char_formatted + r"}" + "\n"
-        latex += right_text.replace("\n", r"\\" + "\n") + "\n"
-        latex += "}\n"
+        yield f"\\ParallelLText{{%\n\\charname{{{left_char_formatted}}}\n{left_text}\n}}\n"
+        yield f"\\ParallelRText{{%\n\\charname{{{right_char_formatted}}}\n{right_text}\n}}\n"
         
         # Add parallel paragraph separator if not the last dialogue
         if i < num_dialogues - 1:
-            latex += r"\ParallelPar" + "\n"
+            yield r"\ParallelPar" + "\n"
     
     # End document
-    latex += r"""
+    yield r"""
 \end{Parallel}
 
 \end{document}
 """
-    
-    return latex
 
 def show_message(stdscr, message, y=None, x=None, wait_for_key=True):
     """Show a message on the screen."""
@@ -515,15 +758,22 @@ def show_message(stdscr, message, y=None, x=None, wait_for_key=True):
 def main(stdscr):
     # Set up colors
     curses.start_color()
-    curses.init_pair(1, curses.COLOR_BLUE, curses.COLOR_BLACK)
-    curses.init_pair(2, curses.COLOR_GREEN, curses.COLOR_BLACK)
-    curses.init_pair(3, curses.COLOR_RED, curses.COLOR_BLACK)
     
-    # Hide cursor if possible
+    # Keep the terminal's own background so curses doesn't have to paint and
+    # reset a black one around colored text
     try:
-        curses.curs_set(1)  # Make cursor visible but not too distracting
-    except:
-        pass  # Some terminals don't support cursor visibility
+        curses.use_default_colors()
+        background = -1
+    except curses.error:
+        background = curses.COLOR_BLACK
+    
+    curses.init_pair(1, curses.COLOR_BLUE, background)
+    curses.init_pair(2, curses.COLOR_GREEN, background)
+    curses.init_pair(3, curses.COLOR_RED, background)
+    
+    # Show the cursor while waiting for input; editors hide it during
+    # larger redraws
+    set_cursor_visibility(1)
     
     # Enable non-blocking input
     stdscr.nodelay(0)
@@ -623,9 +873,6 @@ def main(stdscr):
             2, 0
         )
     
-    # Generate LaTeX
-    latex_content = generate_latex(title, author, left_dialogues, right_dialogues)
-    
     # Determine output filename (sanitize title for filename)
     safe_title = "".join(c if c.isalnum() or c in "._- " else "_" for c in title)
     safe_title = safe_title.replace(" ", "_")
@@ -633,10 +880,10 @@ def main(stdscr):
         safe_title = "parallel_translation"
     output_filename = f"{safe_title}_parallel.tex"
     
-    # Write to file with UTF-8 encoding explicitly
+    # Generate LaTeX straight into the file, with UTF-8 encoding explicitly
     try:
         with open(output_filename, "w", encoding="utf-8") as f:
-            f.write(latex_content)
+            f.writelines(generate_latex(title, author, left_dialogues, right_dialogues))
             
         # Show success message
         stdscr.clear()